@@ -1,79 +1,230 @@
+import io
 import logging
+import os
 import re
-from collections import deque
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Iterator, Optional
+from typing import IO, Callable, Iterator, Optional
 
-from cattree.gitignore_parsing import build_gitignore_regex
+from cattree.gitignore_parsing import build_gitignore_filters
+
+try:
+    # Optional: google-re2 matches with a linear-time DFA, which pays off
+    # when gitignore merges produce huge alternations and also rules out
+    # catastrophic backtracking. Install with the "re2" extra.
+    import re2 as _re2
+except ImportError:
+    _re2 = None
 
 LOGGER = logging.getLogger(__name__)
 
-ALLOWED_PATTERNS = [
-    r".*\.py$",
-    r".*\.md$",
-    r".*\.txt$",
-    r".*\.yml$",
-    r".*\.yaml$",
-    r".*\.json$",
-    r".*\.toml$",
-    r".*\.cpp$",
-    r".*\.h$",
-    r".*\.hpp$",
-    r".*\.c$",
-]
-ALLOWED_REGEX = re.compile("|".join(ALLOWED_PATTERNS))
-
-BLACKLISTED_PATTERNS = [
-    r"^\.",
-    r"__pycache__",
-]
-BLACKLISTED_REGEX = re.compile("|".join(BLACKLISTED_PATTERNS))
-
-
-@dataclass(frozen=True)
+# Extensions are a pure suffix test, so a set lookup beats a regex
+# alternation by a couple of orders of magnitude per entry.
+ALLOWED_EXTENSIONS = frozenset(
+    {"py", "md", "txt", "yml", "yaml", "json", "toml", "cpp", "h", "hpp", "c"}
+)
+
+# Checked with str.startswith (C-implemented, accepts a tuple), which beats
+# dispatching into the regex engine for what are plain name prefixes.
+BLACKLISTED_PREFIXES = (".", "__pycache__")
+
+
+# Below this many alternatives the backtracking engine wins on setup cost.
+_RE2_MIN_ALTERNATIVES = 16
+
+
+def _compile_reject_regex(exclude_pattern: Optional[str]) -> Optional[re.Pattern]:
+    """
+    Compile the fused reject alternation (user exclude + merged gitignore)
+    for one traversal.
+
+    Large alternations are handed to google-re2 when it is installed; its
+    DFA scans in linear time regardless of how many gitignore rules were
+    merged in. Patterns re2 cannot express fall back to the stdlib engine.
+
+    Args:
+        exclude_pattern (Optional[str]): Regex pattern to exclude specific
+            files or directories, if any.
+
+    Returns:
+        Optional[re.Pattern]: Compiled pattern (or an API-compatible re2
+            pattern), or None when there is nothing to exclude.
+    """
+    if not exclude_pattern:
+        return None
+    if _re2 is not None and exclude_pattern.count("|") >= _RE2_MIN_ALTERNATIVES:
+        try:
+            return _re2.compile(exclude_pattern)
+        except _re2.error:
+            LOGGER.debug("Pattern not supported by re2, using stdlib re")
+    return re.compile(exclude_pattern)
+
+
+# Precomputed tree-drawing pieces: indexing the table is O(1) and avoids
+# allocating a fresh prefix string per emitted line. 64 levels covers any
+# realistic tree; _indent grows the table for deeper ones so even those
+# allocate each prefix only once.
+_INDENTS = ["    " * depth for depth in range(64)]
+_CONNECTORS = ("└── ", "├── ")  # indexed by the is_dir flag
+_SEPARATOR = "-" * 80 + "\n"
+
+# Linux-only; 0 elsewhere, which os.open ignores.
+_O_NOATIME = getattr(os, "O_NOATIME", 0)
+
+
+def _read_text_raw(path: Path) -> str:
+    """
+    Read a whole file through one unbuffered read.
+
+    The fstat size is used as the read length so regular files come back in
+    a single syscall instead of buffered chunks, and O_NOATIME (where the
+    kernel and file ownership allow it) skips the access-time update.
+
+    Args:
+        path (Path): Path to the file.
+
+    Returns:
+        str: The decoded file content.
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY | _O_NOATIME)
+    except PermissionError:
+        if not _O_NOATIME:
+            raise
+        # O_NOATIME is only permitted for the file owner; retry without it.
+        fd = os.open(path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        data = os.read(fd, size) if size else b""
+        if len(data) < size:
+            # Short read (interrupted, or the file changed underneath us);
+            # fall back to chunked reads for the rest.
+            parts = [data]
+            while chunk := os.read(fd, io.DEFAULT_BUFFER_SIZE):
+                parts.append(chunk)
+            data = b"".join(parts)
+    finally:
+        os.close(fd)
+    return data.decode("utf-8")
+
+
+def _indent(depth: int) -> str:
+    """Return the tree indent for a depth, growing the cache as needed."""
+    while len(_INDENTS) <= depth:
+        _INDENTS.append(_INDENTS[-1] + "    ")
+    return _INDENTS[depth]
+
+# Rebuilding the gitignore merge means re-walking the tree for .gitignore
+# files, which is wasted work for callers that invoke generate_cattree
+# repeatedly (watchers, editor integrations). Entries expire quickly so
+# .gitignore edits are still picked up.
+_GITIGNORE_CACHE: dict[str, tuple[float, tuple[str, frozenset[str]]]] = {}
+_GITIGNORE_CACHE_TTL_SECONDS = 5.0
+_GITIGNORE_CACHE_MAX_ENTRIES = 64
+
+
+def _build_gitignore_filters_cached(directory: Path) -> tuple[str, frozenset[str]]:
+    """
+    Return build_gitignore_filters(directory), memoized per resolved
+    directory for a few seconds.
+
+    Args:
+        directory (Path): Root directory to search for .gitignore files.
+
+    Returns:
+        tuple[str, frozenset[str]]: Regex alternation and literal-name set
+            combining all .gitignore entries.
+    """
+    key = str(directory.resolve())
+    now = time.monotonic()
+    cached = _GITIGNORE_CACHE.get(key)
+    if cached is not None and now - cached[0] < _GITIGNORE_CACHE_TTL_SECONDS:
+        return cached[1]
+
+    filters = build_gitignore_filters(directory)
+    if len(_GITIGNORE_CACHE) >= _GITIGNORE_CACHE_MAX_ENTRIES:
+        _GITIGNORE_CACHE.clear()
+    _GITIGNORE_CACHE[key] = (now, filters)
+    return filters
+
+
+@dataclass(frozen=True, slots=True)
 class DirectoryEntry:
     path: Path
     depth: int
+    # Entry type as reported by the directory scan, cached so consumers do
+    # not have to stat the path again.
+    is_dir: bool
+    is_file: bool
+
+
+@lru_cache(maxsize=8192)
+def _regex_name_hit(pattern: re.Pattern, name: str) -> bool:
+    """
+    Whether pattern matches the bare name, memoized.
+
+    The same basenames (__init__.py, README.md, index.ts) recur all over a
+    tree; caching by (pattern, name) amortizes the engine dispatch across
+    those duplicates. Relative-path probes vary per occurrence and are not
+    cached.
+    """
+    return pattern.search(name) is not None
 
 
 def _matches_pattern(
-    path: Path,
-    root_path: Path,
-    include: Optional[str] = None,
-    exclude: Optional[str] = None,
+    name: str,
+    relative_path: str,
+    is_file: bool,
+    include: Optional[re.Pattern] = None,
+    exclude: Optional[re.Pattern] = None,
+    exclude_names: Optional[frozenset[str]] = None,
 ) -> bool:
     """
     Check if a file or directory matches the include, exclude, and blacklist
     regex patterns.
 
     Args:
-        path (Path): The path to check.
-        root_path (Path): The root directory path for relative path calculation.
-        include (Optional[str]): Regex pattern to include specific files
-            or directories.
-        exclude (Optional[str]): Regex pattern to exclude specific files
-            or directories.
+        name (str): The base name of the entry.
+        relative_path (str): Path relative to the traversal root, used for
+            gitignore-style matching. The caller carries it through the walk
+            so it never has to be recomputed from the full path.
+        is_file (bool): Whether the path is a regular file. Passed in so the
+            caller can reuse the type cached by the directory scan instead of
+            triggering a fresh stat call here.
+        include (Optional[re.Pattern]): Compiled pattern to include specific
+            files or directories.
+        exclude (Optional[re.Pattern]): Compiled pattern to exclude specific
+            files or directories.
+        exclude_names (Optional[frozenset[str]]): Literal names to exclude
+            outright (e.g. bare gitignore rules), checked with a set lookup
+            before any regex dispatch.
 
     Returns:
         bool: True if the path matches the patterns, False otherwise.
     """
-    name = path.name
-    # Get relative path from root for gitignore-style matching
-    try:
-        relative_path = str(path.relative_to(root_path))
-    except ValueError:
-        relative_path = name
-
-    if path.is_file() and not ALLOWED_REGEX.match(name):
-        return False
-    if BLACKLISTED_REGEX.match(name):
+    if is_file:
+        _, dot, extension = name.rpartition(".")
+        if not dot or extension not in ALLOWED_EXTENSIONS:
+            return False
+    if name.startswith(BLACKLISTED_PREFIXES):
         return False
-    # Check against both name and relative path for gitignore compatibility
-    if exclude and (re.search(exclude, name) or re.search(exclude, relative_path)):
-        return False
-    if include and not (re.search(include, name) or re.search(include, relative_path)):
+    if exclude_names and name in exclude_names:
         return False
+    # Check against both name and relative path for gitignore compatibility.
+    # User exclude and merged gitignore rules are fused into one alternation
+    # by the caller, so one engine pass covers every reject rule. Name
+    # probes go through the memoized helper; path probes cannot be cached.
+    if exclude:
+        if _regex_name_hit(exclude, name) or exclude.search(relative_path):
+            return False
+    if include:
+        if not (_regex_name_hit(include, name) or include.search(relative_path)):
+            return False
     return True
 
 
@@ -81,6 +232,9 @@ def traverse_directory_dfs(
     directory: Path,
     include_pattern: Optional[str] = None,
     exclude_pattern: Optional[str] = None,
+    ordered: bool = True,
+    prune: Optional[Callable[[str], bool]] = None,
+    exclude_names: Optional[frozenset[str]] = None,
 ) -> Iterator[DirectoryEntry]:
     """
     Traverse a directory in DFS order and yield DirectoryEntry objects.
@@ -91,33 +245,232 @@ def traverse_directory_dfs(
             files or directories.
         exclude_pattern (Optional[str]): Regex pattern to exclude specific
             files or directories.
+        ordered (bool): Sort siblings (directories first, then
+            case-insensitive by name). Pass False when the caller does not
+            care about ordering: surviving files are then yielded straight
+            from the scan without buffering a sorted sibling list.
+        prune (Optional[Callable[[str], bool]]): Called with each surviving
+            subdirectory's path string; returning True skips that whole
+            subtree without scanning it. Lets --only avoid walking branches
+            that cannot contain an allowed path.
+        exclude_names (Optional[frozenset[str]]): Literal names to exclude
+            with a set lookup, short-circuiting the exclude regex for bare
+            gitignore rules like node_modules.
 
     Yields:
-        DirectoryEntry: Pydantic model with path and depth.
+        DirectoryEntry: Dataclass with path and depth.
     """
     if not directory.is_dir():
         raise ValueError(f"The path {directory} is not a valid directory.")
 
-    root_path = directory
-    stack = deque([(directory, 0)])
+    # Compile user patterns once instead of paying a re-cache lookup per entry.
+    # All regex reject rules (user exclude + merged gitignore) are fused into
+    # a single alternation so each entry costs one engine invocation.
+    # The include pattern stays separate: it is an accept test, and folding it
+    # into the same alternation would let whichever alternative matches
+    # leftmost win regardless of intent.
+    include_regex = re.compile(include_pattern) if include_pattern else None
+    exclude_regex = _compile_reject_regex(exclude_pattern)
+
+    # The root matches against its own name so dot-file reject rules do not
+    # swallow the whole tree.
+    root_name = directory.name
+    if not _matches_pattern(
+        root_name,
+        root_name,
+        is_file=False,
+        include=include_regex,
+        exclude=exclude_regex,
+        exclude_names=exclude_names,
+    ):
+        LOGGER.debug(f"Skipping {directory}")
+        return
+
+    # Stack holds already-filtered entries as (path string, relative path,
+    # is_dir flag, is_file flag, depth). The flags come from the d_type
+    # cached by os.scandir, so no extra stat calls are needed per entry, and
+    # the relative path is extended by string concatenation instead of
+    # recomputing Path.relative_to per entry.
+    stack = [(str(directory), root_name, True, False, 0)]
     while stack:
-        current_path, depth = stack.pop()
+        path_str, relative_path, is_dir, is_file, depth = stack.pop()
 
-        if not _matches_pattern(
-            current_path, root_path, include=include_pattern, exclude=exclude_pattern
-        ):
-            LOGGER.debug(f"Skipping {current_path}")
+        yield DirectoryEntry(
+            path=Path(path_str), depth=depth, is_dir=is_dir, is_file=is_file
+        )
+
+        if not is_dir:
             continue
 
-        yield DirectoryEntry(path=current_path, depth=depth)
+        # All siblings share the directory part of their relative path, so
+        # it is carried on the stack and extended with one concat. Filtering
+        # happens while scanning, so rejected entries are never buffered,
+        # sorted, or pushed.
+        child_rel_prefix = "" if depth == 0 else f"{relative_path}/"
+        child_depth = depth + 1
+        survivors = []
+        # Bind the per-child callables once; inside the scan loop every
+        # global and attribute lookup costs a dict probe per entry.
+        matches = _matches_pattern
+        keep = survivors.append
+        with os.scandir(path_str) as scan:
+            for child in scan:
+                child_is_dir = child.is_dir(follow_symlinks=False)
+                child_is_file = child.is_file()
+                child_rel = child_rel_prefix + child.name
+                if not matches(
+                    child.name,
+                    child_rel,
+                    is_file=child_is_file,
+                    include=include_regex,
+                    exclude=exclude_regex,
+                    exclude_names=exclude_names,
+                ):
+                    LOGGER.debug(f"Skipping {child.path}")
+                    continue
+                if child_is_dir and prune is not None and prune(child.path):
+                    LOGGER.debug(f"Pruning {child.path}")
+                    continue
+                if ordered:
+                    keep(
+                        (
+                            not child_is_dir,
+                            child.name.lower(),
+                            child.path,
+                            child_rel,
+                            child_is_dir,
+                            child_is_file,
+                        )
+                    )
+                elif child_is_dir:
+                    stack.append(
+                        (child.path, child_rel, True, child_is_file, child_depth)
+                    )
+                else:
+                    yield DirectoryEntry(
+                        path=Path(child.path),
+                        depth=child_depth,
+                        is_dir=False,
+                        is_file=child_is_file,
+                    )
+
+        if ordered:
+            # Decorate-sort: the tuples lead with (not is_dir, lowercased
+            # name), so comparing them directly needs no key function, and
+            # sorting descending lands the children on the stack in one
+            # pass, popping back off in display order. Case-colliding names
+            # tie-break on the path, which is deterministic across
+            # filesystems where raw scandir order is not.
+            survivors.sort(reverse=True)
+            stack.extend(
+                (child_path, child_rel, child_is_dir, child_is_file, child_depth)
+                for _, _, child_path, child_rel, child_is_dir, child_is_file in survivors
+            )
+
+
+def traverse_directory_parallel(
+    directory: Path,
+    include_pattern: Optional[str] = None,
+    exclude_pattern: Optional[str] = None,
+    max_workers: int = 1,
+) -> Iterator[DirectoryEntry]:
+    """
+    Traverse a directory in DFS order, scanning directories on a thread pool.
+
+    Directory listings are fetched ahead of the consumer by worker threads,
+    which overlaps the readdir round-trips that dominate wall time on
+    high-latency filesystems (NFS/SMB). Entries are still yielded in the
+    exact order produced by traverse_directory_dfs.
+
+    Args:
+        directory (Path): The root directory to traverse.
+        include_pattern (Optional[str]): Regex pattern to include specific
+            files or directories.
+        exclude_pattern (Optional[str]): Regex pattern to exclude specific
+            files or directories.
+        max_workers (int): Number of scanning threads. The default of 1
+            delegates to the serial traversal, which is faster on local
+            disks where threading overhead outweighs the overlap.
+
+    Yields:
+        DirectoryEntry: Dataclass with path, depth and cached type flags.
+    """
+    if max_workers <= 1:
+        yield from traverse_directory_dfs(
+            directory,
+            include_pattern=include_pattern,
+            exclude_pattern=exclude_pattern,
+        )
+        return
+
+    if not directory.is_dir():
+        raise ValueError(f"The path {directory} is not a valid directory.")
+
+    include_regex = re.compile(include_pattern) if include_pattern else None
+    exclude_regex = _compile_reject_regex(exclude_pattern)
+
+    futures: dict[str, Future] = {}
+    futures_lock = threading.Lock()
+
+    def submit_scan(path_str: str, rel_prefix: str) -> None:
+        with futures_lock:
+            if path_str not in futures:
+                futures[path_str] = executor.submit(
+                    scan_directory, path_str, rel_prefix
+                )
 
-        if current_path.is_dir():
-            entries = sorted(
-                current_path.iterdir(),
-                key=lambda p: (p.is_file(), p.name.lower()),
+    def scan_directory(
+        path_str: str, rel_prefix: str
+    ) -> list[tuple[str, bool, bool]]:
+        # Same filter + sort as the serial walker; surviving subdirectories
+        # are submitted immediately so the pool keeps scanning ahead of the
+        # consumer.
+        with os.scandir(path_str) as scan:
+            entries = [
+                (e.is_dir(follow_symlinks=False), e.name.lower(), e) for e in scan
+            ]
+        entries.sort(key=lambda item: (not item[0], item[1]))
+        surviving = []
+        for child_is_dir, _, child in entries:
+            child_is_file = child.is_file()
+            child_rel = rel_prefix + child.name
+            if not _matches_pattern(
+                child.name,
+                child_rel,
+                is_file=child_is_file,
+                include=include_regex,
+                exclude=exclude_regex,
+            ):
+                LOGGER.debug(f"Skipping {child.path}")
+                continue
+            surviving.append((child.path, child_is_dir, child_is_file))
+            if child_is_dir:
+                submit_scan(child.path, f"{child_rel}/")
+        return surviving
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        if not _matches_pattern(
+            directory.name,
+            directory.name,
+            is_file=False,
+            include=include_regex,
+            exclude=exclude_regex,
+        ):
+            return
+
+        submit_scan(str(directory), "")
+        stack = [(str(directory), True, False, 0)]
+        while stack:
+            path_str, is_dir, is_file, depth = stack.pop()
+            yield DirectoryEntry(
+                path=Path(path_str), depth=depth, is_dir=is_dir, is_file=is_file
             )
-            for entry in reversed(entries):
-                stack.append((entry, depth + 1))
+            if is_dir:
+                children = futures[path_str].result()
+                stack.extend(
+                    (child_path, child_is_dir, child_is_file, depth + 1)
+                    for child_path, child_is_dir, child_is_file in reversed(children)
+                )
 
 
 def format_file_content(
@@ -144,34 +497,46 @@ def format_file_content(
     if not path.is_file():
         raise ValueError(f"The path {path} is not a valid file.")
 
-    lines = [f"{path.relative_to(root_path)}:\n"]
+    # Pure string op; Path.relative_to would allocate and compare part tuples.
+    lines = [f"{os.path.relpath(path, root_path)}:\n"]
     try:
-        with open(path, "r", encoding="utf-8") as file:
-            content = file.readlines()
+        if max_lines is not None:
+            # Read a single line past the cap purely to detect
+            # truncation, so a file with exactly max_lines lines is
+            # shown whole without a spurious ellipsis.
+            with open(path, "r", encoding="utf-8") as file:
+                content = list(islice(file, max_lines + 1))
+            if len(content) > max_lines:
+                content[max_lines:] = ["..."]
+        else:
+            # One raw read; split into lines only when compacting needs them.
+            text = _read_text_raw(path)
+            content = text.splitlines(keepends=True) if compact_code else [text]
     except UnicodeDecodeError as e:
         raise ValueError(f"Failed to read file {path}") from e
 
-    if max_lines is not None:
-        content = content[:max_lines]
-        if len(content) == max_lines:
-            content.append("...")
-
     if compact_code:
-        content = [re.sub(r"\s+", " ", line).strip() for line in content]
+        # Same whitespace collapsing as re.sub(r"\s+", " ", ...).strip(),
+        # but done by C-level str.split/str.join with no engine dispatch.
+        content = [" ".join(line.split()) for line in content]
 
     lines.extend(content)
 
     return "".join(lines)
 
 
-def _is_path_allowed(path: Path, only_paths: set[Path], root: Path) -> bool:
+def _is_path_allowed(
+    path: Path, only_paths: set[Path], only_dirs: set[Path]
+) -> bool:
     """
     Check if a path should be included based on --only filter.
 
     Args:
         path (Path): Path to check.
         only_paths (set[Path]): Set of allowed paths from --only.
-        root (Path): Root directory.
+        only_dirs (set[Path]): The subset of only_paths that are directories,
+            precomputed by the caller so the stat happens once per --only
+            path instead of once per visited entry.
 
     Returns:
         bool: True if path is allowed, False otherwise.
@@ -183,13 +548,12 @@ def _is_path_allowed(path: Path, only_paths: set[Path], root: Path) -> bool:
         return True
 
     # Check if path is a descendant of any allowed directory
-    for allowed in only_paths:
-        if allowed.is_dir():
-            try:
-                path_resolved.relative_to(allowed)
-                return True
-            except ValueError:
-                continue
+    for allowed in only_dirs:
+        try:
+            path_resolved.relative_to(allowed)
+            return True
+        except ValueError:
+            continue
 
     # Check if path is an ancestor of any allowed path
     for allowed in only_paths:
@@ -202,21 +566,26 @@ def _is_path_allowed(path: Path, only_paths: set[Path], root: Path) -> bool:
     return False
 
 
-def generate_cattree(
+def write_cattree(
     directory: Path,
+    out: IO[str],
     only_paths: Optional[list[str]] = None,
     include_pattern: Optional[str] = None,
     exclude_pattern: Optional[str] = None,
     gitignore: bool = False,
     max_lines: Optional[int] = None,
     compact_code: bool = False,
-) -> str:
+) -> None:
     """
-    Generate a directory tree structure with optional file content
-    and regex filtering.
+    Write a directory tree structure with optional file content and regex
+    filtering directly to a text sink.
+
+    Streaming to the sink keeps peak memory at roughly the largest single
+    file instead of the whole output.
 
     Args:
         directory (Path): Path to the root directory.
+        out (IO[str]): Text sink the tree and file contents are written to.
         only_paths (Optional[list[str]]): Specific paths to include (maintains hierarchy).
             Takes priority over include_pattern.
         include_pattern (Optional[str]): Regex pattern to include specific
@@ -227,30 +596,51 @@ def generate_cattree(
         max_lines (Optional[int]): Maximum number of lines to read per file.
         compact_code (bool): Whether to remove whitespace from the
             file content.
-
-    Returns:
-        str: A string representing the directory tree structure.
     """
     # Build allowed paths set if --only is specified
     only_paths_set = None
+    only_dirs_set: set[Path] = set()
+    prune = None
     if only_paths:
         only_paths_set = {(directory / p).resolve() for p in only_paths}
+        only_dirs_set = {p for p in only_paths_set if p.is_dir()}
+
+        # Prune whole subtrees that can neither contain an allowed path nor
+        # lead to one: without this, --only still walks every sibling
+        # subtree just to discard its entries one by one.
+        allowed_strs = [str(p) for p in only_paths_set]
+        sep = os.sep
+
+        def prune(path_str: str) -> bool:
+            resolved = os.path.realpath(path_str)
+            for allowed in allowed_strs:
+                if resolved == allowed:
+                    return False
+                # Under an allowed directory, or an ancestor of one
+                if resolved.startswith(allowed + sep):
+                    return False
+                if allowed.startswith(resolved + sep):
+                    return False
+            return True
         # --only takes priority over --include-pattern
         include_pattern = None
 
+    exclude_names: Optional[frozenset[str]] = None
     if gitignore:
-        gitignore_pattern = build_gitignore_regex(directory)
+        gitignore_pattern, exclude_names = _build_gitignore_filters_cached(directory)
         exclude_pattern = f"{exclude_pattern or ''}|{gitignore_pattern}".strip("|")
 
     LOGGER.debug(f"Final exclude pattern: {exclude_pattern}")
 
-    tree_structure: list[str] = [directory.name]
-    file_contents: list[str] = [""]
+    out.write(directory.name)
+    file_entries: list[DirectoryEntry] = []
 
     for entry in traverse_directory_dfs(
         directory,
         include_pattern=include_pattern,
         exclude_pattern=exclude_pattern,
+        prune=prune,
+        exclude_names=exclude_names,
     ):
         if entry.depth == 0:
             # Skip reprinting the root directory itself
@@ -258,32 +648,80 @@ def generate_cattree(
 
         # If --only is specified, skip paths not allowed
         if only_paths_set and not _is_path_allowed(
-            entry.path, only_paths_set, directory
+            entry.path, only_paths_set, only_dirs_set
         ):
             continue
 
         # Build the tree prefix based on depth
-        prefix = "    " * (entry.depth - 1)
-        connector = "├── " if entry.path.is_dir() else "└── "
-        tree_structure.append(f"{prefix}{connector}{entry.path.name}")
-
-        if entry.path.is_file():
-            file_contents.append(
-                format_file_content(
-                    path=entry.path,
-                    root_path=directory,
-                    max_lines=max_lines,
-                    compact_code=compact_code,
-                )
-            )
-        else:
-            file_contents.append("")  # Empty line for directories
+        indent = entry.depth - 1
+        prefix = _INDENTS[indent] if indent < len(_INDENTS) else _indent(indent)
+        connector = _CONNECTORS[entry.is_dir]
+        out.write(f"\n{prefix}{connector}{entry.path.name}")
+
+        if entry.is_file:
+            file_entries.append(entry)
+
+    out.write("\n")
+
+    # Read file contents on a thread pool: the reads are independent and
+    # I/O-bound, and the GIL is released while each one waits on the disk.
+    # executor.map keeps the results in traversal order, and streaming them
+    # out as they arrive avoids holding every file in memory at once.
+    def read_entry(entry: DirectoryEntry) -> str:
+        return format_file_content(
+            path=entry.path,
+            root_path=directory,
+            max_lines=max_lines,
+            compact_code=compact_code,
+        )
+
+    if not file_entries:
+        return
+    first = True
+    # I/O-bound work: oversubscribe the cores but never spawn more threads
+    # than there are files to read.
+    max_workers = min(32, 4 * (os.cpu_count() or 1), len(file_entries))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for content in executor.map(read_entry, file_entries):
+            if not content:
+                continue
+            if not first:
+                out.write(_SEPARATOR)
+            out.write(content)
+            first = False
+
 
-    formatted_directory_tree = "\n".join(tree_structure)
-    formatted_file_contents = f"{'-' * 80}\n".join(
-        (content for content in file_contents if content)
+def generate_cattree(
+    directory: Path,
+    only_paths: Optional[list[str]] = None,
+    include_pattern: Optional[str] = None,
+    exclude_pattern: Optional[str] = None,
+    gitignore: bool = False,
+    max_lines: Optional[int] = None,
+    compact_code: bool = False,
+) -> str:
+    """
+    Generate a directory tree structure with optional file content
+    and regex filtering.
+
+    Thin wrapper around write_cattree for callers that want the whole
+    output as one string. See write_cattree for the argument details.
+
+    Returns:
+        str: A string representing the directory tree structure.
+    """
+    buffer = io.StringIO()
+    write_cattree(
+        directory,
+        buffer,
+        only_paths=only_paths,
+        include_pattern=include_pattern,
+        exclude_pattern=exclude_pattern,
+        gitignore=gitignore,
+        max_lines=max_lines,
+        compact_code=compact_code,
     )
-    return f"{formatted_directory_tree}\n{formatted_file_contents}"
+    return buffer.getvalue()
 
 
 if __name__ == "__main__":
@@ -1,8 +1,9 @@
+import sys
 from pathlib import Path
 
 import typer
 
-from cattree.cattree import generate_cattree
+from cattree.cattree import write_cattree
 
 app = typer.Typer(
     name="cattree",
@@ -56,8 +57,10 @@ def cattree(
     Generate a directory tree for a given directory path.
     """
     try:
-        output = generate_cattree(
+        # Stream straight to stdout instead of buffering the whole output.
+        write_cattree(
             directory=path,
+            out=sys.stdout,
             only_paths=only if only else None,
             include_pattern=include_pattern,
             exclude_pattern=exclude_pattern,
@@ -65,7 +68,7 @@ def cattree(
             max_lines=max_lines,
             compact_code=compact_code,
         )
-        typer.echo(output)
+        sys.stdout.write("\n")
     except ValueError as e:
         typer.echo(f"Error: {e}", err=True)
         raise typer.Exit(code=1)
@@ -1,4 +1,6 @@
+import os
 import re
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -22,10 +24,15 @@ def _parse_gitignore(gitignore_path: Path) -> list[str]:
         ]
 
 
+@lru_cache(maxsize=4096)
 def _convert_gitignore_to_regex(pattern: str) -> Optional[str]:
     """
     Convert a single .gitignore pattern to a regex string.
 
+    Pure string-to-string, so results are memoized: common patterns like
+    ``*.pyc`` or ``__pycache__/`` recur across nested .gitignore files and
+    skip the escape/replace pipeline after the first conversion.
+
     Args:
         pattern (str): A .gitignore pattern.
 
@@ -55,43 +62,113 @@ def _convert_gitignore_to_regex(pattern: str) -> Optional[str]:
     pattern = pattern.replace(r"\*\*", "DOUBLESTAR")  # Placeholder
     pattern = pattern.replace(r"\*", "[^/]*")  # * matches anything except /
     pattern = pattern.replace(r"\?", "[^/]")  # ? matches single char except /
-    pattern = pattern.replace("DOUBLESTAR", ".*")  # ** matches anything including /
+    # ** matches anything including /. (?s:.) compiles to the engine's
+    # ANY_ALL opcode, which skips the not-a-newline test plain . performs
+    # on every character; paths never contain newlines anyway.
+    pattern = pattern.replace("DOUBLESTAR", "(?s:.)*")
     
-    # Build the final regex
+    # Build the final regex. Groups are non-capturing: these patterns are
+    # only ever probed for a match, and capturing would make the engine
+    # record group spans on every hit.
     if is_root_relative:
         # Pattern like /build/ or /file.txt - match from root
         if is_dir_only:
-            return f"^{pattern}(/.*)?$"
+            return f"^{pattern}(?:/(?s:.)*)?$"
         else:
             return f"^{pattern}$"
     else:
         # Pattern like build/ or *.pyc - match anywhere in the tree
         if is_dir_only:
             # Match directory name anywhere and everything inside it
-            return f"(^|/){pattern}(/.*)?$"
+            return f"(?:^|/){pattern}(?:/(?s:.)*)?$"
         else:
             # Match file/directory name anywhere
-            return f"(^|/){pattern}$"
+            return f"(?:^|/){pattern}$"
 
 
-def build_gitignore_regex(directory: Path) -> str:
+# A pattern containing any of these needs the regex machinery; anything else
+# is a bare name that can be matched with a set lookup.
+_NON_LITERAL_CHARS = frozenset("*?[]!/\\")
+
+
+def _collect_gitignore_patterns(directory: Path) -> list[str]:
     """
-    Build a single regex pattern from all .gitignore files in the directory tree.
+    Gather deduplicated patterns from all .gitignore files under directory.
 
     Args:
         directory (Path): Root directory to search for .gitignore files.
 
     Returns:
-        str: A single regex pattern combining all .gitignore entries.
+        list[str]: Patterns in first-seen order, without duplicates.
     """
     patterns = []
+    for dirpath, dirnames, filenames in os.walk(directory):
+        # Hidden and __pycache__ directories are never displayed by the
+        # traversal, so their .gitignore files should not contribute rules;
+        # pruning them here also keeps the discovery pass out of .git and
+        # virtualenv internals, which glob("**/...") used to crawl whole.
+        dirnames[:] = [
+            name
+            for name in dirnames
+            if not name.startswith((".", "__pycache__"))
+        ]
+        if ".gitignore" in filenames:
+            patterns.extend(_parse_gitignore(Path(dirpath) / ".gitignore"))
+
+    # Deduplicate while keeping first-seen order; duplicate patterns would
+    # only bloat the final alternation.
+    return list(dict.fromkeys(patterns))
+
+
+def build_gitignore_filters(directory: Path) -> tuple[str, frozenset[str]]:
+    """
+    Build the gitignore filters for a directory tree, split by match kind.
+
+    Bare-name rules like ``node_modules/`` or ``.env`` make up most of a
+    typical .gitignore; pulling them out into a set lets the traversal
+    reject matching entries with one hash lookup instead of running the
+    combined regex.
+
+    Args:
+        directory (Path): Root directory to search for .gitignore files.
+
+    Returns:
+        tuple[str, frozenset[str]]: The regex alternation for the patterns
+            that need one, and the set of literal names to exclude outright.
+    """
+    literal_names = set()
+    regex_patterns = []
+    for pattern in _collect_gitignore_patterns(directory):
+        stripped = pattern.rstrip("/")
+        if stripped and not (frozenset(stripped) & _NON_LITERAL_CHARS):
+            # A trailing slash only restricts the rule to directories, but
+            # the regex form matches a same-named file too (the name search
+            # hits either way), so both collapse to a name lookup.
+            literal_names.add(stripped)
+        elif regex := _convert_gitignore_to_regex(pattern):
+            regex_patterns.append(regex)
+
+    # Wrap each alternative so the combined pattern stays well-formed when
+    # callers concatenate it with their own exclude regex.
+    combined = "|".join(f"(?:{regex})" for regex in regex_patterns)
+    return combined, frozenset(literal_names)
+
+
+def build_gitignore_regex(directory: Path) -> str:
+    """
+    Build a single regex pattern from all .gitignore files in the directory tree.
 
-    for gitignore_file in directory.glob("**/.gitignore"):
-        patterns.extend(_parse_gitignore(gitignore_file))
+    Args:
+        directory (Path): Root directory to search for .gitignore files.
 
+    Returns:
+        str: A single regex pattern combining all .gitignore entries.
+    """
     regex_patterns = [
-        regex for pattern in patterns if (regex := _convert_gitignore_to_regex(pattern))
+        regex
+        for pattern in _collect_gitignore_patterns(directory)
+        if (regex := _convert_gitignore_to_regex(pattern))
     ]
 
-    combined_regex = "|".join(regex_patterns)
+    combined_regex = "|".join(f"(?:{regex})" for regex in regex_patterns)
     return combined_regex